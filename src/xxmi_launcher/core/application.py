@@ -25,6 +25,7 @@ from core.package_manager import PackageManager
 from core.packages.launcher_package import LauncherPackage
 from core.packages.migoto_package import MigotoPackage
 from core.packages.genshin_fps_unlock_package import GenshinFpsUnlockerPackage
+from core.packages.model_importers import model_importer
 from core.packages.model_importers.gimi_package import GIMIPackage
 from core.packages.model_importers.srmi_package import SRMIPackage
 from core.packages.model_importers.wwmi_package import WWMIPackage
@@ -626,6 +627,9 @@ class Application:
         logging.debug(f'Joining threads...')
         for thread in self.threads:
             thread.join()
+        # Wait for desktop shortcuts deployment
+        logging.debug(f'Joining shortcut worker...')
+        model_importer.wait_for_shortcuts()
         # Join watchdog thread
         logging.debug(f'Joining watchdog thread...')
         self.is_alive = False
@@ -4,6 +4,7 @@ import json
 
 from pathlib import Path
 from dataclasses import dataclass, field, fields
+from functools import cached_property
 from typing import Union, Dict, Any, Optional
 
 from dacite import from_dict
@@ -58,9 +59,15 @@ class AppConfig:
     def __post_init__(self):
         self.active_theme = 'Default'
 
-    @property
+    def __setattr__(self, name, value):
+        # Drop cached theme path on theme change, it'll be rebuilt on next access
+        if name == 'active_theme':
+            self.__dict__.pop('theme_path', None)
+        super().__setattr__(name, value)
+
+    @cached_property
     def theme_path(self) -> Path:
-        return Paths.App.Themes / Config.active_theme
+        return Paths.App.Themes / self.active_theme
 
     @property
     def config_path(self):
@@ -3,8 +3,6 @@ import sys
 import logging
 import subprocess
 import time
-import winshell
-import pythoncom
 import winreg
 
 from dataclasses import dataclass, field
@@ -178,6 +176,8 @@ class LauncherPackage(Package):
                 Events.Fire(Events.Application.ShowInfo(title='Update Notification', message=msg))
 
     def create_shortcut(self):
+        import winshell
+        import pythoncom
         pythoncom.CoInitialize()
 
         with winshell.shortcut(str(Path(winshell.desktop()) / f'XXMI Launcher.lnk')) as link:
@@ -195,6 +195,7 @@ class LauncherPackage(Package):
     def uninstall(self):
         log.debug(f'Uninstalling package {self.metadata.package_name}...')
 
+        import winshell
         shortcut_path = Path(winshell.desktop()) / f'XXMI Launcher.lnk'
         if shortcut_path.is_file():
             log.debug(f'Removing {shortcut_path}...')
@@ -1,15 +1,19 @@
 import logging
 import os
+import mmap
 import sys
 import shutil
-import winshell
-import pythoncom
 import re
+import stat
+import ctypes
+import hashlib
 import time
 
-from datetime import datetime
 from pathlib import Path
-from typing import Optional, Union, Dict, List, Tuple
+from threading import Thread
+from typing import Optional, Union, Dict, List, Tuple, Any, Iterable
+from functools import cached_property, lru_cache
+from concurrent.futures import ThreadPoolExecutor, Future
 from dataclasses import dataclass, field
 from enum import Enum
 
@@ -24,6 +28,30 @@ from core.utils.ini_handler import IniHandler, IniHandlerSettings
 log = logging.getLogger(__name__)
 
 
+def initialize_shortcut_worker():
+    # pywin32 modules are heavy to import and needed only for shortcuts, so they're imported on demand
+    import pythoncom
+    pythoncom.CoInitialize()
+
+
+# Shortcuts are created via COM, so they're offloaded to a dedicated worker thread with its own COM apartment
+shortcut_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='ShortcutWorker', initializer=initialize_shortcut_worker)
+
+
+def wait_for_shortcuts():
+    # Pending shortcuts must be deployed before launcher saves config and exits
+    shortcut_executor.shutdown(wait=True)
+
+
+@lru_cache(maxsize=32)
+def stat_folder(folder: str, epoch: int) -> Optional[os.stat_result]:
+    # Epoch is a part of the cache key only, passing current second as one makes cached results expire each second
+    try:
+        return os.stat(folder)
+    except OSError:
+        return None
+
+
 class SettingType(Enum):
     Constant = 'constant'
     Bool = 'bool'
@@ -80,7 +108,41 @@ class ModelImporterConfig:
     ] = field(default_factory=lambda: {})
     configure_game: bool = True
 
-    @property
+    def __setattr__(self, name, value):
+        # Drop cached values derived from reassigned field, they'll be rebuilt on next access
+        if name == 'd3dx_ini':
+            self.__dict__.pop('d3dx_ini_columns', None)
+        elif name == 'importer_folder':
+            self.__dict__.pop('importer_path', None)
+        super().__setattr__(name, value)
+
+    @cached_property
+    def d3dx_ini_columns(self) -> Dict[str, Tuple[Tuple[str, ...], Tuple[str, ...], Dict[Optional[str], Tuple[Any, ...]]]]:
+        # Maps setting name to parallel tuples of sections, options and values of its d3dx_ini tree
+        # Values are stored as separate tuple per value key (`None` for constants, `on` & `off` for bools and so on)
+        # so picking values for given key takes a single lookup, missing values are stored as `None`
+        columns = {}
+        for setting_name, settings in self.d3dx_ini.items():
+            rows = [(section, option, value) for section, options in settings.items() for option, value in options.items()]
+            keys = []
+            for section, option, value in rows:
+                for key in value.keys() if isinstance(value, dict) else [None]:
+                    if key not in keys:
+                        keys.append(key)
+            columns[setting_name] = (
+                tuple(sys.intern(section) for section, option, value in rows),
+                tuple(sys.intern(option) for section, option, value in rows),
+                {
+                    key: tuple(
+                        value.get(key, None) if isinstance(value, dict) else value if key is None else None
+                        for section, option, value in rows
+                    )
+                    for key in keys
+                },
+            )
+        return columns
+
+    @cached_property
     def importer_path(self) -> Path:
         importer_path = Path(self.importer_folder)
         if importer_path.is_absolute():
@@ -181,14 +243,23 @@ class ModelImporterPackage(Package):
     def __init__(self, metadata: PackageMetadata):
         super().__init__(metadata)
         self.backups_path = None
+        self.backups_path_verified = False
         self.use_hook: bool = True
         self.ini = None
+        self.ini_cache: Optional[Tuple[int, List[Tuple[str, str, Any]], IniHandler]] = None
+        self.ini_stat: Optional[Tuple[int, Path, Optional[os.stat_result]]] = None
+        self.prefetch_thread: Optional[Thread] = None
 
     def validate_game_path(self, game_folder) -> Path:
-        game_path = Path(game_folder)
-        if not str(game_folder):
+        game_folder = str(game_folder)
+        if not game_folder:
             raise ValueError(f'Game installation folder is not specified!')
-        if not game_path.is_absolute() or not game_path.is_dir():
+        game_path = Path(game_folder)
+        if not game_path.is_absolute():
+            raise ValueError(f'Specified game installation folder is not found!')
+        # Single stat call tells both if folder exists and if it's a directory
+        folder_stat = stat_folder(game_folder, int(time.monotonic()))
+        if folder_stat is None or not stat.S_ISDIR(folder_stat.st_mode):
             raise ValueError(f'Specified game installation folder is not found!')
         return game_path
 
@@ -198,18 +269,22 @@ class ModelImporterPackage(Package):
     def load(self):
         self.subscribe(Events.ModelImporter.Install, self.install)
         self.subscribe(Events.ModelImporter.StartGame, self.start_game)
-        self.subscribe(Events.ModelImporter.ValidateGameFolder, lambda event: self.validate_game_folder(event))
+        self.subscribe(Events.ModelImporter.ValidateGameFolder, lambda event: self.validate_game_folder(event.game_folder))
         self.subscribe(Events.ModelImporter.CreateShortcut, lambda event: self.create_shortcut())
         super().load()
-        if self.get_installed_version() != '' and not Config.Active.Importer.shortcut_deployed:
-            self.create_shortcut()
+        if self.get_installed_version() != '':
+            # Warm up OS file cache with d3dx.ini in advance, so game start won't have to wait for disk
+            self.prefetch_thread = Thread(target=self.prefetch_d3dx_ini, args=(Config.Active.Importer.importer_path / 'd3dx.ini',), daemon=True)
+            self.prefetch_thread.start()
+            if not Config.Active.Importer.shortcut_deployed:
+                self.create_shortcut()
 
     def unload(self):
         self.unsubscribe()
         super().unload()
 
-    def validate_game_folder(self, event):
-        game_path = self.validate_game_path(event.game_folder)
+    def validate_game_folder(self, game_folder):
+        game_path = self.validate_game_path(game_folder)
         self.validate_game_exe_path(game_path)
 
     def validate_game_folders(self, game_folders: List[Path]):
@@ -350,6 +425,8 @@ class ModelImporterPackage(Package):
     def install_latest_version(self, clean):
         Events.Fire(Events.PackageManager.InitializeInstallation())
 
+        self.wait_for_prefetch()
+
         self.initialize_backup()
         d3dx_ini_path = Config.Active.Importer.importer_path / 'd3dx.ini'
         self.backup(d3dx_ini_path)
@@ -365,6 +442,11 @@ class ModelImporterPackage(Package):
         if not Config.Active.Importer.overwrite_ini:
             self.restore(d3dx_ini_path)
 
+        # d3dx.ini was replaced, so everything cached about it is no longer valid
+        self.ini_stat = None
+        self.ini_cache = None
+        d3dx_ini_path.with_name('d3dx.ini.applied').unlink(missing_ok=True)
+
         if not Config.Active.Importer.shortcut_deployed:
             self.create_shortcut()
 
@@ -385,27 +467,57 @@ class ModelImporterPackage(Package):
     def update_d3dx_ini(self, game_exe_path: Path):
         Events.Fire(Events.Application.StatusUpdate(status='Updating d3dx.ini...'))
 
+        self.wait_for_prefetch()
+
         ini_path = Config.Active.Importer.importer_path / 'd3dx.ini'
 
         Events.Fire(Events.Application.VerifyFileAccess(path=ini_path, write=True))
 
-        log.debug(f'Reading d3dx.ini...')
-        with open(ini_path, 'r', encoding='utf-8') as f:
-            ini = IniHandler(IniHandlerSettings(ignore_comments=False), f)
+        # Setting stacks of d3dx_ini config to apply with their types and values
+        ini_schema = [('core', SettingType.Constant, None)]
+        if Config.Active.Migoto.enforce_rendering:
+            ini_schema.append(('enforce_rendering', SettingType.Constant, None))
+        ini_schema += [
+            ('calls_logging', SettingType.Bool, Config.Active.Migoto.calls_logging),
+            ('debug_logging', SettingType.Bool, Config.Active.Migoto.debug_logging),
+            ('mute_warnings', SettingType.Bool, Config.Active.Migoto.mute_warnings),
+            ('enable_hunting', SettingType.Bool, Config.Active.Migoto.enable_hunting),
+            ('dump_shaders', SettingType.Bool, Config.Active.Migoto.dump_shaders),
+        ]
 
         # Set default game exe as target, can be overridden via XXMI Launcher Config.json:
         # 1. Locate "Importers" > "GIMI" > "Importer" > "d3dx_ini"> "core" > "Loader"
         # 2. Add `"target": "GenshinImpact.exe",` line before `"loader": "XXMI Launcher.exe"`
-        ini.set_option('Loader', 'target', game_exe_path.name)
+        options = [('Loader', 'target', game_exe_path.name)]
+        options += [
+            option
+            for setting_name, setting_type, setting_value in ini_schema
+            for option in self.get_default_ini_values(setting_name, setting_type, setting_value)
+        ]
+
+        ini_stat = self.get_d3dx_ini_stat()
+        if ini_stat is None:
+            raise ValueError(f'Missing critical file: {ini_path.name}!')
+        fingerprint_path = ini_path.with_name('d3dx.ini.applied')
+
+        if self.ini_cache is not None and self.ini_cache[0] == ini_stat.st_mtime_ns:
+            # Reuse parsed ini from previous launch, as the file wasn't modified since then
+            cached_options, ini = self.ini_cache[1], self.ini_cache[2]
+            if cached_options == options:
+                log.debug(f'Settings are already applied to d3dx.ini, skipping update...')
+                self.ini = ini
+                return
+            ini.reset_modified()
+        elif self.read_applied_fingerprint(fingerprint_path) == self.get_applied_fingerprint(options, ini_stat):
+            # Same settings were applied by previous launcher run and the file wasn't modified since then
+            log.debug(f'Settings are already applied to d3dx.ini, skipping update...')
+            # Ini will be parsed on demand
+            self.ini = None
+            return
+        else:
+            ini = self.read_d3dx_ini(ini_path)
 
-        self.set_default_ini_values(ini, 'core', SettingType.Constant)
-        if Config.Active.Migoto.enforce_rendering:
-            self.set_default_ini_values(ini, 'enforce_rendering', SettingType.Constant)
-        self.set_default_ini_values(ini, 'calls_logging', SettingType.Bool, Config.Active.Migoto.calls_logging)
-        self.set_default_ini_values(ini, 'debug_logging', SettingType.Bool, Config.Active.Migoto.debug_logging)
-        self.set_default_ini_values(ini, 'mute_warnings', SettingType.Bool, Config.Active.Migoto.mute_warnings)
-        self.set_default_ini_values(ini, 'enable_hunting', SettingType.Bool, Config.Active.Migoto.enable_hunting)
-        self.set_default_ini_values(ini, 'dump_shaders', SettingType.Bool, Config.Active.Migoto.dump_shaders)
+        ini.set_options(options)
 
         if ini.is_modified():
             log.debug(f'Writing d3dx.ini...')
@@ -413,32 +525,99 @@ class ModelImporterPackage(Package):
                 f.write(ini.to_string())
 
         self.ini = ini
+        ini_stat = self.get_d3dx_ini_stat(reset=True)
+        self.ini_cache = (ini_stat.st_mtime_ns, options, ini)
+        self.write_applied_fingerprint(fingerprint_path, self.get_applied_fingerprint(options, ini_stat))
 
-    def set_default_ini_values(self, ini: IniHandler, setting_name: str, setting_type: SettingType, setting_value=None):
-        settings = Config.Active.Importer.d3dx_ini.get(setting_name, None)
-        if settings is None:
-            raise ValueError(f'Config is missing {setting_name} setting!')
-        for section, options in settings.items():
-            for option, values in options.items():
+    @staticmethod
+    def get_applied_fingerprint(options: List[Tuple[str, str, Any]], ini_stat: os.stat_result) -> bytes:
+        # File mtime and size make fingerprint invalid as soon as d3dx.ini gets modified by anything else
+        fingerprint = hashlib.sha1(repr(options).encode())
+        fingerprint.update(f'{ini_stat.st_mtime_ns}:{ini_stat.st_size}'.encode())
+        return fingerprint.digest()
 
-                key, value = None, None
+    @staticmethod
+    def read_applied_fingerprint(fingerprint_path: Path) -> Optional[bytes]:
+        try:
+            return fingerprint_path.read_bytes()
+        except OSError:
+            return None
 
-                if setting_type == SettingType.Constant:
-                    value = values
-                elif setting_type == SettingType.Bool:
-                    key = 'on' if setting_value else 'off'
-                    value = values[key]
-                elif setting_type == SettingType.Map:
-                    key = setting_value
-                    value = values[key]
+    @staticmethod
+    def write_applied_fingerprint(fingerprint_path: Path, fingerprint: bytes):
+        # Fingerprint is an optimization only, so failure to write it must not prevent game start
+        try:
+            fingerprint_path.write_bytes(fingerprint)
+        except OSError as e:
+            log.debug(f'Failed to write {fingerprint_path}: {e}')
 
-                if value is None:
-                    raise ValueError(f'Config is missing value for section `{section}` option `{option}` key `{key}')
+    def get_d3dx_ini(self) -> IniHandler:
+        # d3dx.ini isn't parsed when applied settings fingerprint matches, so it's loaded on first request
+        if self.ini is None:
+            self.ini = self.read_d3dx_ini(Config.Active.Importer.importer_path / 'd3dx.ini')
+        return self.ini
 
-                try:
-                    ini.set_option(section, option, value)
-                except Exception as e:
-                    raise ValueError(f'Failed to set section {section} option {option} to {value}: {str(e)}') from e
+    def get_d3dx_ini_stat(self, reset: bool = False) -> Optional[os.stat_result]:
+        # d3dx.ini is checked several times during game start, so its stat is reused until the next second
+        ini_path = Config.Active.Importer.importer_path / 'd3dx.ini'
+        epoch = int(time.monotonic())
+        if reset or self.ini_stat is None or self.ini_stat[0] != epoch or self.ini_stat[1] != ini_path:
+            try:
+                ini_stat = os.stat(ini_path)
+            except OSError:
+                ini_stat = None
+            self.ini_stat = (epoch, ini_path, ini_stat)
+        return self.ini_stat[2]
+
+    @staticmethod
+    def prefetch_d3dx_ini(ini_path: Path):
+        try:
+            # Plain read loads the file into OS cache without holding a memory mapping of it
+            with open(ini_path, 'rb') as f:
+                f.read()
+        except Exception as e:
+            log.debug(f'Failed to prefetch {ini_path}: {e}')
+
+    def wait_for_prefetch(self):
+        # Open d3dx.ini handle would prevent it from being replaced or written on Windows
+        if self.prefetch_thread is not None:
+            self.prefetch_thread.join()
+            self.prefetch_thread = None
+
+    def read_d3dx_ini(self, ini_path: Path) -> IniHandler:
+        log.debug(f'Reading d3dx.ini...')
+        with open(ini_path, 'rb') as f:
+            # Zero-length files cannot be mapped
+            if os.fstat(f.fileno()).st_size == 0:
+                data = b''
+            else:
+                with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                    # Let OS read ahead the whole file at once (not available on Windows)
+                    if hasattr(mmap, 'MADV_WILLNEED'):
+                        mm.madvise(mmap.MADV_WILLNEED)
+                    data = mm[:]
+        return IniHandler.from_string(IniHandlerSettings(ignore_comments=False), data.decode('utf-8'))
+
+    def get_default_ini_values(self, setting_name: str, setting_type: SettingType, setting_value=None) -> Iterable[Tuple[str, str, Any]]:
+        columns = Config.Active.Importer.d3dx_ini_columns.get(setting_name, None)
+        if columns is None:
+            raise ValueError(f'Config is missing {setting_name} setting!')
+        sections, options, values = columns
+        if len(sections) == 0:
+            return []
+
+        key = None
+        if setting_type == SettingType.Bool:
+            key = 'on' if setting_value else 'off'
+        elif setting_type == SettingType.Map:
+            key = setting_value
+
+        column = values.get(key, None)
+        if column is None or None in column:
+            missing_id = 0 if column is None else column.index(None)
+            raise ValueError(f'Config is missing value for section `{sections[missing_id]}` option `{options[missing_id]}` key `{key}')
+
+        return zip(sections, options, column)
 
     def get_start_cmd(self, game_path: Path) -> Tuple[Path, List[str], Optional[str]]:
         game_exe_path = self.validate_game_exe_path(game_path)
@@ -471,7 +650,7 @@ class ModelImporterPackage(Package):
 
     def validate_package_files(self):
         ini_path = Config.Active.Importer.importer_path / 'd3dx.ini'
-        if not ini_path.exists():
+        if self.get_d3dx_ini_stat() is None:
             user_requested_restore = Events.Call(Events.Application.ShowError(
                 modal=True,
                 confirm_text='Restore',
@@ -485,39 +664,73 @@ class ModelImporterPackage(Package):
                 raise ValueError(f'Missing critical file: {ini_path.name}!')
 
             Events.Fire(Events.Application.Update(no_thread=True, force=True, reinstall=True, packages=[self.metadata.package_name]))
+            self.ini_stat = None
 
     def initialize_backup(self):
-        backup_name = self.metadata.package_name + ' ' + datetime.now().strftime('%Y-%m-%d %H-%M-%S')
+        backup_name = f'{self.metadata.package_name} {time.strftime("%Y-%m-%d %H-%M-%S")}'
         self.backups_path = Paths.App.Backups / backup_name
+        self.backups_path_verified = False
 
     def backup(self, file_path: Path):
         if not file_path.exists():
             return
-        Paths.verify_path(self.backups_path)
-        shutil.copy2(file_path, self.backups_path / file_path.name)
+        if not self.backups_path_verified:
+            Paths.verify_path(self.backups_path)
+            self.backups_path_verified = True
+        self.copy_file(file_path, self.backups_path / file_path.name)
 
     def restore(self, file_path: Path):
         backup_path = self.backups_path / file_path.name
         if not backup_path.exists():
             return
-        shutil.copy2(backup_path, file_path)
+        self.copy_file(backup_path, file_path)
+
+    @staticmethod
+    def copy_file(src_path: Path, dst_path: Path):
+        # Let Windows copy file in kernel, it preserves timestamps and attributes just like shutil.copy2
+        if os.name == 'nt':
+            cancel = ctypes.c_int(0)
+            if ctypes.windll.kernel32.CopyFileExW(str(src_path), str(dst_path), None, None, ctypes.byref(cancel), 0):
+                return
+        # Fall back to regular copy, it also raises descriptive error if copying is impossible
+        shutil.copy2(src_path, dst_path)
+
+    def create_shortcut(self) -> Future:
+        # Capture active importer settings right away, as selection may change before the worker gets to it
+        importer_name = Config.Launcher.active_importer
+        importer_config = Config.Active.Importer
+        icon_path = Config.Config.theme_path / 'Shortcuts' / f'{importer_name}.ico'
+        future = shortcut_executor.submit(self.deploy_shortcut, importer_name, importer_config, icon_path)
+        future.add_done_callback(self.report_shortcut_error)
+        return future
 
-    def create_shortcut(self):
-        pythoncom.CoInitialize()
-        with winshell.shortcut(str(Path(winshell.desktop()) / f'{Config.Launcher.active_importer} Quick Start.lnk')) as link:
+    @staticmethod
+    def deploy_shortcut(importer_name: str, importer_config: ModelImporterConfig, icon_path: Path):
+        import winshell
+        with winshell.shortcut(str(Path(winshell.desktop()) / f'{importer_name} Quick Start.lnk')) as link:
             link.path = str(Path(sys.executable))
-            link.description = f'Start game with {Config.Launcher.active_importer} and skip launcher load'
+            link.description = f'Start game with {importer_name} and skip launcher load'
             link.working_directory = str(Paths.App.Resources / 'Bin')
-            link.arguments = f'--nogui --xxmi {Config.Launcher.active_importer}'
-            link.icon_location = (str(Config.Config.theme_path / 'Shortcuts' / f'{Config.Launcher.active_importer}.ico'), 0)
-        Config.Active.Importer.shortcut_deployed = True
+            link.arguments = f'--nogui --xxmi {importer_name}'
+            link.icon_location = (str(icon_path), 0)
+        importer_config.shortcut_deployed = True
+
+    @staticmethod
+    def report_shortcut_error(future: Future):
+        error = future.exception()
+        if error is None:
+            return
+        log.error(f'Failed to create desktop shortcut:', exc_info=error)
+        Events.Fire(Events.Application.ShowError(
+            message=f'Failed to create desktop shortcut:\n\n{error}',
+        ))
 
     def disable_duplicate_libraries(self, libs_path: Path):
         log.debug(f'Searching for duplicate libs...')
         mods_path = Config.Active.Importer.importer_path / 'Mods'
 
         exclude_patterns = []
-        include_options = self.ini.get_section('Include').options
+        include_options = self.get_d3dx_ini().get_section('Include').options
         for option_name, exclude_pattern, _, _, _ in include_options:
             exclude_pattern = exclude_pattern.lower()
             if option_name.lower() == 'exclude_recursive':
@@ -556,7 +769,7 @@ class ModelImporterPackage(Package):
         for ini_path in duplicate_ini_paths:
             disabled_ini_path = ini_path.parent / f'DISABLED_{ini_path.name}'
             if disabled_ini_path.is_file():
-                timestamp = datetime.now().strftime('%Y-%m-%d_%H-%M-%S')
+                timestamp = time.strftime('%Y-%m-%d_%H-%M-%S')
                 disabled_ini_path = ini_path.parent / f'DISABLED_{ini_path.stem}_{timestamp}{ini_path.suffix}'
             ini_path.rename(disabled_ini_path)
             time.sleep(0.001)
@@ -642,6 +855,7 @@ class ModelImporterPackage(Package):
             log.debug(f'Removing {self.package_path}...')
             shutil.rmtree(self.package_path)
 
+        import winshell
         shortcut_path = Path(winshell.desktop()) / f'{self.metadata.package_name} Quick Start.lnk'
         if shortcut_path.is_file():
             log.debug(f'Removing {shortcut_path}...')
@@ -1,3 +1,4 @@
+import io
 import re
 import logging
 
@@ -89,6 +90,11 @@ class IniHandler:
         self.footer_comments = []
         self.from_file(f)
 
+    @classmethod
+    def from_string(cls, cfg: IniHandlerSettings, string: str):
+        # Universal newlines mode makes parsing results identical to text mode file reading
+        return cls(cfg, io.StringIO(string, newline=None))
+
     def from_file(self, f):
         log.debug(f'Parsing ini...')
         section_pattern = re.compile(r'^\[(.+)\]')
@@ -147,6 +153,10 @@ class IniHandler:
                 return True
         return False
 
+    def reset_modified(self):
+        for section in self.sections.values():
+            section.modified = False
+
     def to_string(self):
         result = ''
         for section in self.sections.values():
@@ -162,3 +172,18 @@ class IniHandler:
         if section is None:
             section = self.add_section(section_name)
         section.set_option(option_name, option_value, flag_modified=modified, overwrite=overwrite, comments=comments)
+
+    def set_options(self, options, modified=True, overwrite=True):
+        # Bulk version of set_option, resolves every section only once
+        sections = {}
+        for section_name, option_name, option_value in options:
+            section = sections.get(section_name, None)
+            if section is None:
+                section = self.get_section(section_name)
+                if section is None:
+                    section = self.add_section(section_name)
+                sections[section_name] = section
+            try:
+                section.set_option(option_name, option_value, flag_modified=modified, overwrite=overwrite)
+            except Exception as e:
+                raise ValueError(f'Failed to set section {section_name} option {option_name} to {option_value}: {str(e)}') from e
@@ -60,9 +60,10 @@ class OverwriteIniCheckbox(UICheckbox):
         self.set_tooltip(self.get_tooltip)
 
     def get_tooltip(self):
-        msg = f'Enabled: {Config.Launcher.active_importer} updates will overwrite existing d3dx.ini to ensure its up-to-date state.\n'
-        msg += f'Disabled: {Config.Launcher.active_importer} updates will keep existing d3dx.ini untouched.'
-        return msg.strip()
+        return '\n'.join([
+            f'Enabled: {Config.Launcher.active_importer} updates will overwrite existing d3dx.ini to ensure its up-to-date state.',
+            f'Disabled: {Config.Launcher.active_importer} updates will keep existing d3dx.ini untouched.',
+        ])
 
 
 class SecurityLabel(UILabel):
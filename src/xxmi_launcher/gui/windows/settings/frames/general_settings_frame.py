@@ -1,6 +1,6 @@
-import subprocess
+import os
 from pathlib import Path
-from customtkinter import filedialog, ThemeManager
+from customtkinter import ThemeManager
 from textwrap import dedent
 
 import core.event_manager as Events
@@ -12,6 +12,71 @@ from gui.classes.containers import UIFrame
 from gui.classes.widgets import UILabel, UIButton, UIEntry, UICheckbox,  UIOptionMenu
 
 
+# Importer-specific tooltips, built once on import
+_GAME_FOLDER_TOOLTIPS = {
+    'WWMI': 'Path to folder with "Wuthering Waves.exe" and "Client" & "Engine" subfolders.\n'
+            'Usually this folder is named "Wuthering Waves Game" and located inside WuWa installation folder.',
+    'ZZMI': 'Path to folder with "ZenlessZoneZero.exe".',
+    'SRMI': 'Path to folder with "StarRail.exe".\n'
+            'Usually this folder is named "Games" and located inside "DATA" folder of HSR installation folder.',
+    'GIMI': 'Path to folder with "GenshinImpact.exe" or "YuanShen.exe" (CN).\n'
+            'Usually this folder is named "Genshin Impact Game" and located inside "DATA" folder of GI installation folder.',
+}
+
+_LAUNCH_OPTIONS_TOOLTIPS = {
+    'WWMI': 'Command line arguments aka Launch Options to start game exe with.\n'
+            '* Disable intro: -SkipSplash',
+}
+_LAUNCH_OPTIONS_DEFAULT_TOOLTIP = 'Command line arguments aka Launch Options to start game exe with.'
+
+_CONFIGURE_GAME_TOOLTIPS = {
+    'GIMI': dedent("""
+        **Enabled**: Ensure GIMI-compatible in-game **Graphics Settings** before game start:
+
+        - `Dynamic Character Resolution: Off`
+
+        **Disabled**: In-game settings will not be affected.
+
+        <font color="red">⚠ Mods will not work with wrong settings! ⚠</font>
+    """).strip(),
+    'WWMI': dedent("""
+        **Enabled**: Ensure WWMI-compatible in-game **Graphics Settings** before game start:
+
+        - `Graphics Quality: Quality`
+
+        **Disabled**: In-game settings will not be affected.
+
+        <font color="red">⚠ Mods will not work with wrong settings! ⚠</font>
+    """).strip(),
+    'ZZMI': dedent("""
+        **Enabled**: Ensure ZZMI-compatible in-game **Graphics Settings** before game start:
+
+        - `Character Quality: High`
+        - `High-Precision Character Animation: Disabled`
+
+        **Disabled**: In-game settings will not be affected.
+
+        <font color="red">⚠ Mods will not work with wrong settings! ⚠</font>
+    """).strip(),
+}
+
+_UNLOCK_FPS_TOOLTIPS = {
+    'WWMI': 'This option allows to set FPS limit to 120 even on not officially supported devices.\n'
+            '* Enabled: Sets CustomFrameRate to 3 in LocalStorage.db on game start.\n'
+            '* Disabled: Has no effect on FPS settings, use in-game settings to undo already forced 120 FPS.',
+    'SRMI': 'This option allows to set FPS limit to 120.\n'
+            '* Enabled: Updates Graphics Settings Windows Registry key with 120 FPS value on game start.\n'
+            '* Disabled: Has no effect on FPS settings, use in-game settings to undo already forced 120 FPS.\n'
+            'Note: Edits "FPS" value in "HKEY_CURRENT_USER/SOFTWARE/Cognosphere/Star Rail/GraphicsSettings_Model_h2986158309".',
+    'GIMI': 'This option allows to force 120 FPS mode.\n'
+            '* Enabled: Launch game via "unlockfps_nc.exe" and let it run in background to continuously apply FPS limit tweak.\n'
+            '* Disabled: Launch game via original "GenshinImpact.exe" or "YuanShen.exe" (CN), has no effect on FPS.\n'
+            'Hint: If FPS Unlocker package is outdated, you can manually update "unlockfps_nc.exe" from original repository.\n'
+            '* Local Path: Resources/Packages/GI-FPS-Unlocker/unlockfps_nc.exe\n'
+            '* Original Repository: https://github.com/34736384/genshin-fps-unlock',
+}
+
+
 class GeneralSettingsFrame(UIFrame):
     def __init__(self, master):
         super().__init__(master)
@@ -39,25 +104,16 @@ class GeneralSettingsFrame(UIFrame):
             self.put(ConfigureGame(self)).grid(row=3, column=1, padx=(0, 10), pady=(0, 30), sticky='w', columnspan=3)
 
 
-        if Vars.Launcher.active_importer.get() != 'ZZMI':
-            
-            # Tweaks
+        # Tweaks
+        tweak_widgets = _TWEAK_WIDGETS.get(Vars.Launcher.active_importer.get(), None)
+        if tweak_widgets is not None:
             self.put(TweaksLabel(self)).grid(row=4, column=0, padx=(20, 10), pady=(0, 30), sticky='w')
-    
+
             tweaks_frame = UIFrame(self, fg_color=master._fg_color)
             tweaks_frame.grid(row=4, column=1, padx=(0, 0), pady=(0, 30), sticky='we', columnspan=3)
-            
-            tweaks_frame.put(UnlockFPSCheckbox(tweaks_frame)).grid(row=0, column=0, padx=(0, 10), pady=(0, 0), sticky='w')
-    
-            # Window mode for GI FPS Unlocker
-            if Vars.Launcher.active_importer.get() == 'GIMI':
-                tweaks_frame.put(UnlockFPSWindowOptionMenu(tweaks_frame)).grid(row=0, column=1, padx=(20, 10), pady=(0, 0), sticky='w')
-                tweaks_frame.put(EnableHDR(tweaks_frame)).grid(row=0, column=2, padx=(60, 10), pady=(0, 0), sticky='w')
-    
-            #  Performance Tweaks
-            if Vars.Launcher.active_importer.get() == 'WWMI':
-                tweaks_frame.put(ApplyTweaksCheckbox(tweaks_frame)).grid(row=0, column=1, padx=(20, 10), pady=(0, 0), sticky='w')
-                tweaks_frame.put(OpenEngineIniButton(tweaks_frame)).grid(row=0, column=2, padx=(10, 20), pady=(0, 0), sticky='e')
+
+            for column, (widget_class, padx, sticky) in enumerate(tweak_widgets):
+                tweaks_frame.put(widget_class(tweaks_frame)).grid(row=0, column=column, padx=padx, pady=(0, 0), sticky=sticky)
 
 
 class GameFolderLabel(UILabel):
@@ -80,13 +136,24 @@ class GameFolderEntry(UIEntry):
             master=master)
         self.normal_border_color = self._border_color
         self.error_label = error_label
-        self.configure(validate='all', validatecommand=(master.register(self.validate_game_folder), '%P'))
+        self.validation_id = None
+        # Keep active importer package at hand to validate folder without event bus round-trip on every edit
+        self.importer = Events.Call(Events.PackageManager.GetPackage(Config.Launcher.active_importer))
+        self.configure(validate='all', validatecommand=(master.register(self.schedule_game_folder_validation), '%P'))
         self.set_tooltip(self.get_tooltip)
         self.validate_game_folder(Vars.Active.Importer.game_folder.get())
 
+    def schedule_game_folder_validation(self, game_folder):
+        # Validate only once user stops typing instead of checking every intermediate path
+        if self.validation_id is not None:
+            self.after_cancel(self.validation_id)
+        self.validation_id = self.after(200, self.validate_game_folder, game_folder)
+        return True
+
     def validate_game_folder(self, game_folder):
+        self.validation_id = None
         try:
-            game_path = Events.Call(Events.ModelImporter.ValidateGameFolder(game_folder=game_folder))
+            self.importer.validate_game_folder(game_folder)
         except Exception as e:
             self.error_label.configure(text=str(e))
             self.error_label.grid(row=0, column=1, padx=(0, 15), pady=(36, 0), sticky='nwe')
@@ -96,20 +163,13 @@ class GameFolderEntry(UIEntry):
         self.error_label.grid_forget()
         return True
 
+    def destroy(self):
+        if self.validation_id is not None:
+            self.after_cancel(self.validation_id)
+        super().destroy()
+
     def get_tooltip(self):
-        msg = ''
-        if Config.Launcher.active_importer == 'WWMI':
-            msg = 'Path to folder with "Wuthering Waves.exe" and "Client" & "Engine" subfolders.\n'
-            msg += 'Usually this folder is named "Wuthering Waves Game" and located inside WuWa installation folder.'
-        if Config.Launcher.active_importer == 'ZZMI':
-            msg = 'Path to folder with "ZenlessZoneZero.exe".\n'
-        if Config.Launcher.active_importer == 'SRMI':
-            msg = 'Path to folder with "StarRail.exe".\n'
-            msg += 'Usually this folder is named "Games" and located inside "DATA" folder of HSR installation folder.'
-        if Config.Launcher.active_importer == 'GIMI':
-            msg = 'Path to folder with "GenshinImpact.exe" or "YuanShen.exe" (CN).\n'
-            msg += 'Usually this folder is named "Genshin Impact Game" and located inside "DATA" folder of GI installation folder.'
-        return msg.strip()
+        return _GAME_FOLDER_TOOLTIPS.get(Config.Launcher.active_importer, '')
 
 
 class GameFolderErrorLabel(UILabel):
@@ -141,6 +201,7 @@ class ChangeGameFolderButton(UIButton):
         )
 
     def change_game_folder(self):
+        from customtkinter import filedialog
         game_folder = filedialog.askdirectory(initialdir=Vars.Active.Importer.game_folder.get())
         if game_folder == '':
             return
@@ -183,10 +244,7 @@ class LaunchOptionsEntry(UIEntry):
         self.set_tooltip(self.get_tooltip)
 
     def get_tooltip(self):
-        msg = 'Command line arguments aka Launch Options to start game exe with.\n'
-        if Config.Launcher.active_importer == 'WWMI':
-            msg += '* Disable intro: -SkipSplash'
-        return msg.strip()
+        return _LAUNCH_OPTIONS_TOOLTIPS.get(Config.Launcher.active_importer, _LAUNCH_OPTIONS_DEFAULT_TOOLTIP)
 
 
 class ProcessPriorityLabel(UILabel):
@@ -230,39 +288,7 @@ class ConfigureGame(UICheckbox):
         self.set_tooltip(self.get_tooltip)
 
     def get_tooltip(self):
-        msg = ''
-        if Config.Launcher.active_importer == 'GIMI':
-            msg = dedent("""
-                **Enabled**: Ensure GIMI-compatible in-game **Graphics Settings** before game start:
-
-                - `Dynamic Character Resolution: Off`
-
-                **Disabled**: In-game settings will not be affected.
-
-                <font color="red">⚠ Mods will not work with wrong settings! ⚠</font>
-            """)
-        if Config.Launcher.active_importer == 'WWMI':
-            msg = dedent("""
-                **Enabled**: Ensure WWMI-compatible in-game **Graphics Settings** before game start:
-
-                - `Graphics Quality: Quality`
-
-                **Disabled**: In-game settings will not be affected.
-
-                <font color="red">⚠ Mods will not work with wrong settings! ⚠</font>
-            """)
-        if Config.Launcher.active_importer == 'ZZMI':
-            msg = dedent("""
-                **Enabled**: Ensure ZZMI-compatible in-game **Graphics Settings** before game start:
-
-                - `Character Quality: High`
-                - `High-Precision Character Animation: Disabled`
-
-                **Disabled**: In-game settings will not be affected.
-
-                <font color="red">⚠ Mods will not work with wrong settings! ⚠</font>
-            """)
-        return msg.strip()
+        return _CONFIGURE_GAME_TOOLTIPS.get(Config.Launcher.active_importer, '')
 
 
 class OpenEngineIniButton(UIButton):
@@ -278,13 +304,13 @@ class OpenEngineIniButton(UIButton):
 
     def open_engine_ini(self):
         game_folder_path = Path(Vars.Active.Importer.game_folder.get())
-        if 'Wuthering Waves Game' not in str(game_folder_path):
+        if 'Wuthering Waves Game' not in game_folder_path.parts:
             game_folder_path = game_folder_path / 'Wuthering Waves Game'
         if not game_folder_path.is_dir():
             raise ValueError(f'Game folder does not exist: "{game_folder_path}"!')
         engine_ini = game_folder_path / 'Client' / 'Saved' / 'Config' / 'WindowsNoEditor' / 'Engine.ini'
         if engine_ini.is_file():
-            subprocess.Popen([f'{str(engine_ini)}'], shell=True)
+            os.startfile(engine_ini)
         else:
             raise ValueError(f'File does not exist: "{engine_ini}"!')
 
@@ -307,24 +333,7 @@ class UnlockFPSCheckbox(UICheckbox):
         self.set_tooltip(self.get_tooltip)
 
     def get_tooltip(self):
-        msg = ''
-        if Config.Launcher.active_importer == 'WWMI':
-            msg = 'This option allows to set FPS limit to 120 even on not officially supported devices.\n'
-            msg += '* Enabled: Sets CustomFrameRate to 3 in LocalStorage.db on game start.\n'
-            msg += '* Disabled: Has no effect on FPS settings, use in-game settings to undo already forced 120 FPS.'
-        if Config.Launcher.active_importer == 'SRMI':
-            msg = 'This option allows to set FPS limit to 120.\n'
-            msg += '* Enabled: Updates Graphics Settings Windows Registry key with 120 FPS value on game start.\n'
-            msg += '* Disabled: Has no effect on FPS settings, use in-game settings to undo already forced 120 FPS.\n'
-            msg += 'Note: Edits "FPS" value in "HKEY_CURRENT_USER/SOFTWARE/Cognosphere/Star Rail/GraphicsSettings_Model_h2986158309".'
-        if Config.Launcher.active_importer == 'GIMI':
-            msg = 'This option allows to force 120 FPS mode.\n'
-            msg += '* Enabled: Launch game via "unlockfps_nc.exe" and let it run in background to continuously apply FPS limit tweak.\n'
-            msg += '* Disabled: Launch game via original "GenshinImpact.exe" or "YuanShen.exe" (CN), has no effect on FPS.\n'
-            msg += 'Hint: If FPS Unlocker package is outdated, you can manually update "unlockfps_nc.exe" from original repository.\n'
-            msg += '* Local Path: Resources/Packages/GI-FPS-Unlocker/unlockfps_nc.exe\n'
-            msg += '* Original Repository: https://github.com/34736384/genshin-fps-unlock'
-        return msg.strip()
+        return _UNLOCK_FPS_TOOLTIPS.get(Config.Launcher.active_importer, '')
 
 
 class UnlockFPSWindowOptionMenu(UIOptionMenu):
@@ -380,3 +389,23 @@ class EnableHDR(UICheckbox):
             'Warning! Your monitor must support HDR and `Use HDR` must be enabled in Windows Display settings!\n'
             'Enabled: Turn HDR On. Launcher will create HDR registry record each time before the game launch.\n'
             'Disabled: Turn HDR Off. No extra action required, game auto-removes HDR registry record on launch.')
+
+
+# Tweak widgets of every importer with their grid padx and sticky, importers without tweaks are omitted
+_TWEAK_WIDGETS = {
+    'GIMI': [
+        (UnlockFPSCheckbox, (0, 10), 'w'),
+        # Window mode for GI FPS Unlocker
+        (UnlockFPSWindowOptionMenu, (20, 10), 'w'),
+        (EnableHDR, (60, 10), 'w'),
+    ],
+    'SRMI': [
+        (UnlockFPSCheckbox, (0, 10), 'w'),
+    ],
+    'WWMI': [
+        (UnlockFPSCheckbox, (0, 10), 'w'),
+        # Performance Tweaks
+        (ApplyTweaksCheckbox, (20, 10), 'w'),
+        (OpenEngineIniButton, (10, 20), 'e'),
+    ],
+}
@@ -1,4 +1,4 @@
-from customtkinter import filedialog, ThemeManager
+from customtkinter import ThemeManager
 
 import core.event_manager as Events
 import core.config_manager as Config
@@ -157,9 +157,10 @@ class ImporterFolderEntry(UIEntry):
         self.set_tooltip(self.get_tooltip)
 
     def get_tooltip(self):
-        msg = f'* Absolute: Allows to move {Config.Launcher.active_importer} folder to any location (must start with disc name, i.e. "C:/Games/{Config.Launcher.active_importer}/").' + '\n'
-        msg += f'* Relative: Allows to move {Config.Launcher.active_importer} folder to another location INSIDE the Launcher folder (i.e. default "{Config.Launcher.active_importer}/").'
-        return msg.strip()
+        return '\n'.join([
+            f'* Absolute: Allows to move {Config.Launcher.active_importer} folder to any location (must start with disc name, i.e. "C:/Games/{Config.Launcher.active_importer}/").',
+            f'* Relative: Allows to move {Config.Launcher.active_importer} folder to another location INSIDE the Launcher folder (i.e. default "{Config.Launcher.active_importer}/").',
+        ])
 
 
 class ChangeImporterFolderButton(UIButton):
@@ -181,6 +182,7 @@ class ChangeImporterFolderButton(UIButton):
         )
 
     def change_importer_folder(self):
+        from customtkinter import filedialog
         importer_folder = filedialog.askdirectory(initialdir=Vars.Active.Importer.importer_folder.get())
         if importer_folder == '':
             return
@@ -67,9 +67,10 @@ class AutoUpdateCheckbox(UICheckbox):
         self.set_tooltip(self.get_tooltip)
 
     def get_tooltip(self):
-        msg = f'Enabled: Launcher and {Config.Launcher.active_importer} updates will be Downloaded and Installed automatically.\n'
-        msg += 'Disabled: Use special [▲] button next to [Start] button to Download and Install updates manually.'
-        return msg.strip()
+        return '\n'.join([
+            f'Enabled: Launcher and {Config.Launcher.active_importer} updates will be Downloaded and Installed automatically.',
+            'Disabled: Use special [▲] button next to [Start] button to Download and Install updates manually.',
+        ])
 
 
 class ThemeLabel(UILabel):